@@ -2,17 +2,17 @@
 
 from __future__ import annotations
 
-import io
 import os
 import tempfile
-from contextlib import redirect_stdout
 from pathlib import Path
 
-from flask import Flask, render_template_string, request
+from flask import Flask, Response, render_template_string, request, stream_with_context
 
-from BabyAgent.vision import video_GPT
+from BabyAgent.vision import video_GPT_stream
 
 app = Flask(__name__)
+# Cap uploads so one runaway POST can't exhaust a worker.
+app.config["MAX_CONTENT_LENGTH"] = 512 * 1024 * 1024
 
 PAGE_TEMPLATE = """
 <!doctype html>
@@ -43,29 +43,30 @@ PAGE_TEMPLATE = """
 
       <button type="submit">Analyze Video</button>
     </form>
-
-    {% if analysis %}
-      <h2>Analysis Output</h2>
-      <pre>{{ analysis }}</pre>
-    {% endif %}
   </body>
 </html>
 """
 
 
-def run_analysis(video_source: str) -> str:
-    """Invoke BabyAgent.video_GPT and capture its textual output."""
+def run_analysis(video_source: str, temp_path: str | None = None):
+    """Yield BabyAgent analysis text chunks, cleaning up any temp upload.
+
+    Cleanup lives inside the generator because streaming responses run
+    after the view function has already returned.
+    """
 
-    buffer = io.StringIO()
-    with redirect_stdout(buffer):
-        video_GPT(video_path=video_source)
-    return buffer.getvalue()
+    try:
+        yield from video_GPT_stream(video_path=video_source)
+    except Exception as exc:  # pragma: no cover - runtime feedback
+        yield f"\nAnalysis failed: {exc}"
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
 
 
 @app.route("/", methods=["GET", "POST"])
 def index():
     error = None
-    analysis_output = None
 
     if request.method == "POST":
         video_url = (request.form.get("video_url") or "").strip()
@@ -77,31 +78,29 @@ def index():
             error = "Provide either a video file or a URL, not both."
         else:
             temp_path = None
-            try:
-                if uploaded_file and uploaded_file.filename:
-                    suffix = Path(uploaded_file.filename).suffix or ".mp4"
-                    with tempfile.NamedTemporaryFile(
-                        delete=False, suffix=suffix
-                    ) as tmp:
-                        uploaded_file.save(tmp.name)
-                        temp_path = tmp.name
-                    source = temp_path
-                else:
-                    source = video_url
-
-                analysis_output = run_analysis(source)
-            except Exception as exc:  # pragma: no cover - runtime feedback
-                error = f"Analysis failed: {exc}"
-            finally:
-                if temp_path and os.path.exists(temp_path):
-                    os.remove(temp_path)
-
-    return render_template_string(
-        PAGE_TEMPLATE,
-        error=error,
-        analysis=analysis_output,
-    )
+            if uploaded_file and uploaded_file.filename:
+                suffix = Path(uploaded_file.filename).suffix or ".mp4"
+                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+                    # Stream the upload into the open handle in chunks
+                    # instead of buffering it twice.
+                    uploaded_file.save(tmp)
+                    temp_path = tmp.name
+                source = temp_path
+            else:
+                source = video_url
+
+            # Stream tokens to the client as they arrive instead of making
+            # the user wait for the full generation.
+            return Response(
+                stream_with_context(run_analysis(source, temp_path)),
+                mimetype="text/plain",
+            )
+
+    return render_template_string(PAGE_TEMPLATE, error=error)
 
 
 if __name__ == "__main__":
-    app.run(debug=True, port=5000)
+    # Development entry point only. Deploy under a threaded WSGI server so
+    # analyses can overlap and workers share the pooled OpenAI client, e.g.:
+    #   gunicorn -k gthread --workers 4 --threads 8 BabyAgent.app:app
+    app.run(port=5000)
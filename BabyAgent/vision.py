@@ -1,13 +1,19 @@
-from moviepy.video.io.VideoFileClip import VideoFileClip
 import argparse
 import base64
+import hashlib
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
 from openai import OpenAI
 import shutil
+import subprocess
+import tempfile
+import threading
 import cv2
 import os
 import mimetypes
-import tempfile
-import urllib.request
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 from typing import Optional, Tuple
@@ -20,12 +26,60 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     YoutubeDL = None
 
+try:
+    import decord  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    decord = None
+
+try:
+    import pybase64  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    pybase64 = None
+
+try:
+    import diskcache  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    diskcache = None
+
+try:
+    from nvjpeg import NvJpeg  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    NvJpeg = None
+
 
 # === Paths & constants ===
-FRAME_FOLDER = "../data/crying_baby/frames"
 INPUT_VIDEO_PATH = "../data/crying_baby/yongzi.mp4"
-OUTPUT_AUDIO_PATH = "../data/crying_baby/video_audio.wav"
 BABY_CRY_CUES = ("NEH", "OWH", "HEH", "EAIR", "EH")
+# One combined pattern scans the transcript once instead of once per cue.
+_CUE_RE = re.compile(r"\b(" + "|".join(BABY_CRY_CUES) + r")\b", re.IGNORECASE)
+MAX_FRAMES = 12  # cap per-request image payload
+FRAME_MAX_DIM = 768  # vision models gain nothing above this resolution
+FRAME_JPEG_QUALITY = 80
+
+_NVJPEG_ENCODER = None
+_NVJPEG_LOCK = threading.Lock()
+
+
+def encode_frame_jpeg(frame_bgr) -> Optional[bytes]:
+    """JPEG-encode a BGR frame, on-GPU via nvJPEG when configured."""
+
+    global _NVJPEG_ENCODER
+    if _NVJPEG_ENCODER is not None:
+        with _NVJPEG_LOCK:
+            if _NVJPEG_ENCODER is not None:
+                try:
+                    return bytes(
+                        _NVJPEG_ENCODER.encode(frame_bgr, FRAME_JPEG_QUALITY)
+                    )
+                except Exception as e:
+                    print(f"nvJPEG encode failed ({e}); falling back to cv2…")
+                    _NVJPEG_ENCODER = None
+    ok, encoded = cv2.imencode(
+        ".jpg", frame_bgr, [cv2.IMWRITE_JPEG_QUALITY, FRAME_JPEG_QUALITY]
+    )
+    return encoded.tobytes() if ok else None
+
+
 TRANSCRIPTION_PROMPT = (
     "This audio features a baby. When you hear Dunstan baby language sounds like "
     "NEH, OWH, HEH, EAIR, or EH, transcribe them verbatim in uppercase (e.g., NEH)."
@@ -76,23 +130,37 @@ CONSTRAINTS:
 load_dotenv()
 openai_api = os.getenv("OPENAI_API_KEY")
 print(f"OpenAI API Key Loaded: {openai_api is not None}")
-client = OpenAI(api_key=openai_api)
 
+# Opt into GPU JPEG encoding with BABYAGENT_JPEG_BACKEND=nvjpeg; anything
+# else (or a missing nvjpeg package) keeps the cv2/libjpeg path.
+if os.getenv("BABYAGENT_JPEG_BACKEND", "").lower() == "nvjpeg" and NvJpeg is not None:
+    try:
+        _NVJPEG_ENCODER = NvJpeg()
+    except Exception as _exc:  # pragma: no cover - hardware dependent
+        print(f"nvJPEG unavailable ({_exc}); using cv2 JPEG encode")
 
-# === Utilities ===
-def ensure_clean_dir(path: str):
-    os.makedirs(path, exist_ok=True)
-    for fn in os.listdir(path):
-        fp = os.path.join(path, fn)
-        try:
-            if os.path.isfile(fp) or os.path.islink(fp):
-                os.unlink(fp)
-            elif os.path.isdir(fp):
-                shutil.rmtree(fp)
-        except Exception as e:
-            print(f"Failed to delete {fp}. Reason: {e}")
+try:  # HTTP/2 multiplexing needs the optional h2 package
+    import h2  # type: ignore  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    _HTTP2_AVAILABLE = False
+
+# Pooled keep-alive connections so the consecutive transcription + vision
+# calls per video reuse one TLS session instead of re-handshaking.
+http_client = httpx.Client(
+    limits=httpx.Limits(
+        max_keepalive_connections=20,
+        max_connections=100,
+        keepalive_expiry=30.0,
+    ),
+    http2=_HTTP2_AVAILABLE,
+    timeout=120,
+)
+client = OpenAI(api_key=openai_api, http_client=http_client)
 
 
+# === Utilities ===
 def is_url(source: str) -> bool:
     try:
         parsed = urlparse(source)
@@ -109,11 +177,8 @@ def is_youtube_url(source: str) -> bool:
 def detect_baby_sounds(transcript: str) -> list[str]:
     """Return Dunstan baby cues detected in transcript text."""
 
-    found: list[str] = []
-    for cue in BABY_CRY_CUES:
-        if re.search(rf"\b{cue}\b", transcript, flags=re.IGNORECASE):
-            found.append(cue)
-    return found
+    seen = {m.group(1).upper() for m in _CUE_RE.finditer(transcript)}
+    return [cue for cue in BABY_CRY_CUES if cue in seen]
 
 
 def _infer_filename_from_url(url: str, content_type: Optional[str] = None) -> str:
@@ -128,20 +193,26 @@ def _infer_filename_from_url(url: str, content_type: Optional[str] = None) -> st
     return f"{name or 'remote_video'}{ext}"
 
 
+# Downloaded videos are cached on disk so repeat analyses of the same URL
+# skip the multi-MB fetch. Cached files are returned with no cleanup dir,
+# so video_GPT leaves them in place.
+_DL_CACHE_DIR = "/tmp/babyagent_dl"
+_YT_CACHE_DIR = os.path.expanduser("~/.cache/babyagent_yt")
+
+
 def download_youtube_video(
     url: str,
     cookie_file: Optional[str] = None,
     cookies_from_browser: Optional[Tuple[str, Optional[str]]] = None,
-) -> Tuple[str, str]:
+) -> Tuple[str, Optional[str]]:
     if YoutubeDL is None:
         raise RuntimeError(
             "Downloading YouTube URLs requires the yt_dlp package. Install it via `pip install yt_dlp`."
         )
 
-    temp_dir = tempfile.mkdtemp(prefix="babyagent_youtube_")
-    outtmpl = os.path.join(temp_dir, "youtube.%(ext)s")
+    os.makedirs(_YT_CACHE_DIR, exist_ok=True)
     ydl_opts = {
-        "outtmpl": outtmpl,
+        "outtmpl": os.path.join(_YT_CACHE_DIR, "%(id)s.%(ext)s"),
         "quiet": True,
         "noplaylist": True,
         "format": "bestvideo+bestaudio/best",
@@ -153,39 +224,83 @@ def download_youtube_video(
         browser, profile = cookies_from_browser
         ydl_opts["cookiesfrombrowser"] = (browser, profile, None)
 
-    try:
-        with YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-            local_path = ydl.prepare_filename(info)
+    with YoutubeDL(ydl_opts) as ydl:
+        # Resolve the video id first; a cached copy skips the download.
+        info = ydl.extract_info(url, download=False)
+        cached_path = os.path.join(_YT_CACHE_DIR, f"{info['id']}.mp4")
+        if os.path.isfile(cached_path):
+            print(f"Using cached YouTube download {cached_path}")
+            return cached_path, None
+
+        info = ydl.extract_info(url, download=True)
+        local_path = ydl.prepare_filename(info)
         # When merge_output_format is set, the merged file may have the target extension.
         merged_path = os.path.splitext(local_path)[0] + ".mp4"
         if os.path.isfile(merged_path):
             local_path = merged_path
-    except Exception:
-        shutil.rmtree(temp_dir, ignore_errors=True)
-        raise
 
-    return local_path, temp_dir
+    return local_path, None
 
 
-def download_generic_video(url: str) -> Tuple[str, str]:
-    temp_dir = tempfile.mkdtemp(prefix="babyagent_remote_")
-    try:
-        request = urllib.request.Request(
-            url,
-            headers={"User-Agent": "Mozilla/5.0 BabyAgent/1.0"},
-        )
-        with urllib.request.urlopen(request, timeout=120) as response:
-            content_type = response.headers.get("Content-Type")
-            filename = _infer_filename_from_url(url, content_type)
-            local_path = os.path.join(temp_dir, filename)
-            with open(local_path, "wb") as outfile:
-                shutil.copyfileobj(response, outfile)
-    except Exception:
-        shutil.rmtree(temp_dir, ignore_errors=True)
-        raise
+def download_generic_video(url: str) -> Tuple[str, Optional[str]]:
+    os.makedirs(_DL_CACHE_DIR, exist_ok=True)
+    key = hashlib.sha1(url.encode()).hexdigest()
+    meta_path = os.path.join(_DL_CACHE_DIR, key + ".json")
 
-    return local_path, temp_dir
+    headers = {"User-Agent": "Mozilla/5.0 BabyAgent/1.0"}
+    cached_path = None
+    if os.path.isfile(meta_path):
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            candidate = os.path.join(_DL_CACHE_DIR, meta.get("filename", ""))
+            if os.path.isfile(candidate):
+                cached_path = candidate
+                if meta.get("etag"):
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    headers["If-Modified-Since"] = meta["last_modified"]
+        except (ValueError, OSError):
+            pass
+
+    # Reuse the pooled client and copy in 1MB chunks — far fewer
+    # syscalls and Python-level hops than the default 16KB buffer.
+    with http_client.stream(
+        "GET",
+        url,
+        headers=headers,
+        follow_redirects=True,
+    ) as response:
+        if response.status_code == 304 and cached_path:
+            print("Remote video unchanged; using cached download")
+            return cached_path, None
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type")
+        ext = os.path.splitext(_infer_filename_from_url(url, content_type))[1]
+        filename = key + ext
+        local_path = os.path.join(_DL_CACHE_DIR, filename)
+        # Download to a uniquely named sidecar and rename so an interrupted
+        # transfer can never poison the cache entry the ETag still vouches
+        # for — and concurrent fetches of the same URL can't interleave
+        # writes into one shared part file.
+        fd, part_path = tempfile.mkstemp(dir=_DL_CACHE_DIR, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as outfile:
+                for chunk in response.iter_bytes(chunk_size=1 << 20):
+                    outfile.write(chunk)
+            os.replace(part_path, local_path)
+        finally:
+            if os.path.exists(part_path):
+                os.unlink(part_path)
+        meta = {
+            "filename": filename,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        with open(meta_path, "w") as f:
+            json.dump(meta, f)
+
+    return local_path, None
 
 
 def prepare_video_input(
@@ -220,151 +335,234 @@ def cleanup_paths(paths: list[Optional[str]]):
                 print(f"Failed to remove {path}: {exc}")
 
 
+def _extract_frames_decord(
+    video_path: str,
+    interval_sec: float,
+    start_sec: float,
+    end_sec: Optional[float],
+) -> Optional[list[bytes]]:
+    """Decode only the sampled frame indices via decord (GPU when available).
+
+    Returns chronological in-memory JPEG buffers, or None so the caller can
+    fall back to ffmpeg.
+    """
+
+    try:
+        try:
+            vr = decord.VideoReader(video_path, ctx=decord.gpu(0))
+        except Exception:
+            vr = decord.VideoReader(video_path, ctx=decord.cpu(0))
+
+        fps = vr.get_avg_fps() or 30.0
+        step = max(1, int(round(fps * interval_sec)))
+        start_idx = int(start_sec * fps)
+        stop_idx = len(vr) if end_sec is None else min(len(vr), int(end_sec * fps) + 1)
+        indices = list(range(start_idx, stop_idx, step))
+        if not indices:
+            return None
+
+        def _encode(frame) -> Optional[bytes]:
+            frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+            h, w = frame.shape[:2]
+            scale = FRAME_MAX_DIM / max(h, w)
+            if scale < 1:
+                frame = cv2.resize(
+                    frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+                )
+            return encode_frame_jpeg(frame)
+
+        # get_batch decodes just these indices, skipping the frames in between.
+        # Decode in bounded chunks so long videos don't blow up memory, and
+        # JPEG-encode straight from the decoded arrays — no disk round-trip.
+        # imencode releases the GIL, so fanning the encode out over threads
+        # scales with cores.
+        buffers: list[bytes] = []
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as ex:
+            for chunk_start in range(0, len(indices), 32):
+                chunk = indices[chunk_start : chunk_start + 32]
+                batch = vr.get_batch(chunk).asnumpy()
+                buffers.extend(
+                    buf for buf in ex.map(_encode, batch) if buf is not None
+                )
+        return buffers
+    except Exception as e:
+        print(f"decord decode failed ({e}); falling back to ffmpeg…")
+        return None
+
+
 def extract_frames(
     video_path: str,
     interval_sec: float = 0.5,
     start_sec: float = 0.0,
     end_sec: Optional[float] = None,
-):
-    ensure_clean_dir(FRAME_FOLDER)
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        print("Error opening video file")
-        return
+) -> list[bytes]:
+    """Sample frames from the video and return them as in-memory JPEG buffers."""
 
-    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
     safe_start = max(0.0, float(start_sec or 0.0))
     safe_end = float(end_sec) if end_sec is not None else None
 
-    t = safe_start
-    idx = 0
-    while True:
-        if safe_end is not None and t > safe_end:
-            break
-        cap.set(cv2.CAP_PROP_POS_MSEC, t * 1000)
-        ok, frame = cap.read()
-        if not ok:
-            break
-
-        # Optional: normalize size for stable tokens
-        h, w = frame.shape[:2]
-        target_w = 480
-        if w > target_w:
-            scale = target_w / w
-            frame = cv2.resize(
-                frame, (target_w, int(h * scale)), interpolation=cv2.INTER_AREA
-            )
-
-        out_path = os.path.join(FRAME_FOLDER, f"frame_{int(t*1000):010d}.jpg")
-        cv2.imwrite(out_path, frame, [cv2.IMWRITE_JPEG_QUALITY, 92])  # fixed quality
-        idx += 1
-        t += interval_sec
+    if decord is not None:
+        buffers = _extract_frames_decord(
+            video_path, interval_sec, safe_start, safe_end
+        )
+        if buffers is not None:
+            return buffers
+
+    # One ffmpeg pass decodes, samples, resizes, and JPEG-encodes natively —
+    # much faster than seeking/reading frame-by-frame through OpenCV. Frames
+    # land in a per-call temp dir so overlapping analyses (threaded WSGI
+    # workers) can never clobber each other's output.
+    frame_dir = tempfile.mkdtemp(prefix="babyagent_frames_")
+    try:
+        cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-hwaccel", "auto"]
+        if safe_start > 0:
+            cmd += ["-ss", str(safe_start)]
+        if safe_end is not None:
+            cmd += ["-to", str(safe_end)]
+        cmd += [
+            "-i",
+            video_path,
+            # Sample one frame per interval and cap the longer edge so we
+            # never upload more pixels than the vision model can use.
+            "-vf",
+            f"fps=1/{interval_sec},"
+            f"scale=w='min({FRAME_MAX_DIM},iw)':h='min({FRAME_MAX_DIM},ih)':"
+            "force_original_aspect_ratio=decrease:force_divisible_by=2",
+            "-qscale:v",
+            "4",
+            os.path.join(frame_dir, "frame_%07d.jpg"),
+        ]
 
-    cap.release()
-    cv2.destroyAllWindows()
+        try:
+            subprocess.run(cmd, check=True)
+        except (subprocess.CalledProcessError, FileNotFoundError) as exc:
+            print(f"Error extracting frames with ffmpeg: {exc}")
+            return []
+
+        # scandir carries file type info with each entry, avoiding a separate
+        # stat call per frame.
+        entries = sorted(
+            (
+                entry
+                for entry in os.scandir(frame_dir)
+                if entry.is_file() and entry.name.lower().endswith(".jpg")
+            ),
+            key=lambda entry: entry.name,
+        )
+        buffers = []
+        for entry in entries:
+            with open(entry.path, "rb") as f:
+                buffers.append(f.read())
+        return buffers
+    finally:
+        shutil.rmtree(frame_dir, ignore_errors=True)
 
 
-def convert_to_base64(image_path: str) -> str:
-    with open(image_path, "rb") as f:
-        return base64.b64encode(f.read()).decode("ascii")
+def encode_frame_base64(data: bytes) -> str:
+    # pybase64 is a SIMD-accelerated drop-in for the stdlib encoder.
+    encode = pybase64.b64encode if pybase64 is not None else base64.b64encode
+    return encode(data).decode("ascii")
 
 
-def transcribe_audio(audio_path: str) -> str:
+def transcribe_audio(audio_bytes: bytes) -> str:
     """
     Prefer gpt-4o-transcribe; fall back to whisper-1 if unavailable.
     """
     try:
-        with open(audio_path, "rb") as af:
-            resp = client.audio.transcriptions.create(
-                model="gpt-4o-transcribe",
-                file=af,
-                prompt=TRANSCRIPTION_PROMPT,
-                temperature=0.1,
-            )
+        resp = client.audio.transcriptions.create(
+            model="gpt-4o-transcribe",
+            file=("audio.wav", io.BytesIO(audio_bytes), "audio/wav"),
+            prompt=TRANSCRIPTION_PROMPT,
+            temperature=0.1,
+        )
         return resp.text
     except Exception as e:
         print(f"gpt-4o-transcribe failed ({e}); falling back to whisper-1…")
-        with open(audio_path, "rb") as af:
-            resp = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=af,
-                prompt=TRANSCRIPTION_PROMPT,
-            )
+        resp = client.audio.transcriptions.create(
+            model="whisper-1",
+            file=("audio.wav", io.BytesIO(audio_bytes), "audio/wav"),
+            prompt=TRANSCRIPTION_PROMPT,
+        )
         return resp.text
 
 
 def extract_audio_and_transcribe(video_path: str) -> Tuple[str, list[str]]:
-    # Use WAV to avoid needing mp3 codecs (libmp3lame). mp3 is fine if your ffmpeg has the codec.
-    audio_path = OUTPUT_AUDIO_PATH
-
-    # Open the clip with a context manager so resources close cleanly
-    with VideoFileClip(video_path) as clip:
-        if clip.audio is None:
-            transcript = "There is no audio for this video."
-            print(transcript)
-            return transcript, []
-
-        # No 'verbose' kwarg; keep or remove logger. None = no progress bar/logging.
-        # If you really want a progress bar: use logger="bar".
-        clip.audio.write_audiofile(
-            audio_path,
-            logger=None,  # remove this or set to "bar" if you want progress
-            # fps=16000,      # optional: downsample to 16k for ASR
-            # codec="pcm_s16le"  # explicit for wav; omit for defaults
+    # Pipe mono 16kHz WAV straight out of ffmpeg — skips moviepy's Python
+    # layer (which decodes video frames just to reach the audio) and the
+    # temp-file round-trip. WAV avoids needing mp3 codecs (libmp3lame).
+    audio_bytes = b""
+    try:
+        proc = subprocess.run(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-i",
+                video_path,
+                "-vn",
+                "-ac",
+                "1",
+                "-ar",
+                "16000",
+                "-f",
+                "wav",
+                "pipe:1",
+            ],
+            capture_output=True,
         )
-
-    # Now run transcription
-    transcript = transcribe_audio(audio_path)
+        if proc.returncode == 0:
+            audio_bytes = proc.stdout
+    except FileNotFoundError as exc:
+        print(f"ffmpeg not available for audio extraction: {exc}")
+
+    # An empty or header-only WAV means the video carries no audio stream.
+    if len(audio_bytes) <= 44:
+        transcript = "There is no audio for this video."
+        print(transcript)
+        return transcript, []
+
+    transcript = transcribe_audio(audio_bytes)
     baby_cues = detect_baby_sounds(transcript)
     cues_for_log = ", ".join(baby_cues) if baby_cues else "none"
     print(f"Transcript: {transcript[:160]}{'…' if len(transcript) > 160 else ''}")
     print(f"Detected baby cues: {cues_for_log}")
 
-    # (Optional) clean up temp file
-    try:
-        os.remove(audio_path)
-    except OSError:
-        pass
-
     return transcript, baby_cues
 
 
-def analyze_frames_with_responses(
-    prompt_text: str,
-    transcript: str,
-    base64frames: list[str],
-    baby_cues: list[str],
-):
-    """
-    Try the Responses API first (new multimodal). If not available in this env,
-    fall back to Chat Completions with vision content blocks.
+def _sample_evenly(items: list, limit: int) -> list:
+    """Pick up to `limit` items spread evenly across the sequence, in order.
+
+    Head-truncation would throw away the tail of a long video and break the
+    "chronological from earliest to latest" guarantee made in the prompt.
     """
-    # Limit number of frames if needed (avoid huge payloads)
-    MAX_FRAMES = 12
-    frames = base64frames[:MAX_FRAMES]
 
-    # Build payloads for both APIs
-    cues_text = (
+    if len(items) <= limit:
+        return list(items)
+    step = (len(items) - 1) / (limit - 1)
+    return [items[round(i * step)] for i in range(limit)]
+
+
+def _build_cues_text(baby_cues: list[str]) -> str:
+    return (
         "Baby cry cues detected in audio: " + ", ".join(baby_cues)
         if baby_cues
         else "No specific Dunstan baby cry cues detected in audio."
     )
-    # 1) Responses API payload (input_text + input_image)
-    responses_content = [
-        {"type": "input_text", "text": prompt_text},
-        {
-            "type": "input_text",
-            "text": f"Video audio transcript (may be noisy/partial): {transcript}",
-        },
-        {"type": "input_text", "text": cues_text},
-        *(
-            {"type": "input_image", "image_url": f"data:image/jpeg;base64,{b64}"}
-            for b64 in frames
-        ),
-    ]
 
-    # 2) Chat Completions payload (text + image_url)
-    chat_messages = [
+
+def _build_chat_messages(
+    prompt_text: str,
+    transcript: str,
+    frames: list[str],
+    baby_cues: list[str],
+) -> list[dict]:
+    """Chat Completions vision payload shared by the live and batch paths."""
+
+    # Static text leads and per-call text trails so repeat requests share a
+    # byte-identical prefix and hit OpenAI's prompt cache.
+    return [
         {
             "role": "system",
             "content": "You are a careful pediatric behavior analyst. Follow the rubric exactly. Use <=150 words.",
@@ -373,68 +571,263 @@ def analyze_frames_with_responses(
             "role": "user",
             "content": [
                 {"type": "text", "text": prompt_text},
-                {
-                    "type": "text",
-                    "text": f"Video audio transcript (may be noisy/partial): {transcript}",
-                },
-                {"type": "text", "text": cues_text},
                 *(
                     {
                         "type": "image_url",
-                        "image_url": {"url": f"data:image/jpeg;base64,{b64}"},
+                        # "low" detail keeps the per-image token charge flat
+                        "image_url": {
+                            "url": f"data:image/jpeg;base64,{b64}",
+                            "detail": "low",
+                        },
                     }
                     for b64 in frames
                 ),
+                {
+                    "type": "text",
+                    "text": f"Video audio transcript (may be noisy/partial): {transcript}",
+                },
+                {"type": "text", "text": _build_cues_text(baby_cues)},
             ],
         },
     ]
 
-    # Try Responses API first
+
+def analyze_frames_batch(
+    jobs: list[Tuple[str, str, list[str], list[str]]],
+    poll_interval_sec: float = 30.0,
+) -> list[Optional[str]]:
+    """Analyze many videos in one OpenAI Batch API submission.
+
+    Each job is (prompt_text, transcript, base64frames, baby_cues). Batch
+    requests get OpenAI's discounted pricing and amortize per-request
+    overhead, but can take minutes to complete — use this for bulk/offline
+    runs, not the interactive path. Returns analyses in job order, with None
+    for items that failed.
+    """
+
+    lines = []
+    for i, (prompt_text, transcript, base64frames, baby_cues) in enumerate(jobs):
+        body = {
+            "model": "gpt-4.1",
+            "messages": _build_chat_messages(
+                prompt_text,
+                transcript,
+                _sample_evenly(base64frames, MAX_FRAMES),
+                baby_cues,
+            ),
+            "max_tokens": 300,
+            "temperature": 0.1,
+        }
+        lines.append(
+            json.dumps(
+                {
+                    "custom_id": f"job-{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": body,
+                }
+            )
+        )
+
+    input_file = client.files.create(
+        file=("batch_input.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    while batch.status not in {"completed", "failed", "expired", "cancelled"}:
+        time.sleep(poll_interval_sec)
+        batch = client.batches.retrieve(batch.id)
+
+    results: list[Optional[str]] = [None] * len(jobs)
+    if batch.status != "completed" or not batch.output_file_id:
+        print(f"Batch {batch.id} finished with status {batch.status}")
+        return results
+
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        idx = int(item["custom_id"].split("-", 1)[1])
+        response = item.get("response") or {}
+        if response.get("status_code") == 200:
+            choices = response["body"].get("choices") or []
+            if choices:
+                results[idx] = choices[0]["message"]["content"]
+    return results
+
+
+_FRAME_FILE_IDS: dict[str, str] = {}  # sha256(frame bytes) -> uploaded file id
+_FRAME_FILE_IDS_MAX = 256
+
+
+def upload_frames(jpeg_frames: list[bytes]) -> list[str]:
+    """Upload frames to the Files API once, reusing cached IDs on repeats.
+
+    Referencing file IDs avoids base64's 4/3 payload inflation and skips
+    re-uploading identical frames when the same video is analyzed again.
+    """
+
+    file_ids = []
+    for buf in jpeg_frames:
+        key = hashlib.sha256(buf).hexdigest()
+        fid = _FRAME_FILE_IDS.get(key)
+        if fid is None:
+            created = client.files.create(
+                file=("frame.jpg", buf, "image/jpeg"), purpose="vision"
+            )
+            fid = created.id
+            if len(_FRAME_FILE_IDS) >= _FRAME_FILE_IDS_MAX:
+                _FRAME_FILE_IDS.pop(next(iter(_FRAME_FILE_IDS)))
+        else:
+            _FRAME_FILE_IDS.pop(key)  # re-insert below to refresh recency
+        _FRAME_FILE_IDS[key] = fid
+        file_ids.append(fid)
+    return file_ids
+
+
+def stream_frame_analysis(
+    prompt_text: str,
+    transcript: str,
+    jpeg_frames: list[bytes],
+    baby_cues: list[str],
+):
+    """
+    Yield analysis text deltas as they arrive instead of blocking on the
+    full completion. Try the Responses API first (new multimodal); if not
+    available in this env, fall back to Chat Completions with vision blocks.
+    """
+    # Limit number of frames if needed (avoid huge payloads), sampling
+    # evenly so temporal coverage survives the cap
+    frames = _sample_evenly(jpeg_frames, MAX_FRAMES)
+
+    cues_text = _build_cues_text(baby_cues)
+
+    # Try Responses API first: reference uploaded file IDs instead of
+    # embedding base64 data URLs.
+    file_ids: Optional[list[str]] = None
     try:
         _ = getattr(client, "responses")  # raises AttributeError if not present
-        resp = client.responses.create(
+        file_ids = upload_frames(frames)
+    except AttributeError:
+        # No Responses API → fall back to Chat Completions
+        pass
+    except Exception as e:
+        print(f"frame upload failed ({e}); falling back to Chat Completions…")
+
+    if file_ids is not None:
+        # Static prompt first and per-call text last: repeat requests (and
+        # re-analyses of the same video, whose file IDs are stable) share a
+        # byte-identical prefix for OpenAI's prompt cache.
+        responses_content = [
+            {"type": "input_text", "text": prompt_text},
+            *(
+                {"type": "input_image", "file_id": fid, "detail": "low"}
+                for fid in file_ids
+            ),
+            {
+                "type": "input_text",
+                "text": f"Video audio transcript (may be noisy/partial): {transcript}",
+            },
+            {"type": "input_text", "text": cues_text},
+        ]
+        stream = client.responses.create(
             model="gpt-4.1-mini",  # or gpt-4o / gpt-4o-mini
             input=[{"role": "user", "content": responses_content}],
             max_output_tokens=300,
             temperature=0.1,
+            stream=True,
+            prompt_cache_key="baby_vision_v1",
         )
-        # Print best-effort text extraction
-        if hasattr(resp, "output_text") and resp.output_text:
-            print(resp.output_text)
-            return
-        # Fallback parse of blocks
-        for block in getattr(resp, "output", []) or []:
-            if getattr(block, "type", None) == "message":
-                for c in block.content:
-                    if c.get("type") == "output_text":
-                        print(c.get("text", ""))
-                        return
-        print(resp)  # last resort
+        for event in stream:
+            if getattr(event, "type", None) == "response.output_text.delta":
+                yield event.delta
         return
 
-    except AttributeError:
-        # No Responses API → fall back to Chat Completions
-        pass
-
-    # Chat Completions Vision (widely available)
-    resp = client.chat.completions.create(
+    # Chat Completions Vision (widely available). This endpoint needs data
+    # URLs, so base64-encode the frames here, overlapping the work.
+    with ThreadPoolExecutor(max_workers=min(16, max(1, len(frames)))) as ex:
+        base64frames = list(ex.map(encode_frame_base64, frames))
+    chat_messages = _build_chat_messages(
+        prompt_text, transcript, base64frames, baby_cues
+    )
+    stream = client.chat.completions.create(
         model="gpt-4.1",  # vision-capable chat model
         messages=chat_messages,
         max_tokens=300,
         temperature=0.1,
         top_p=1,
+        stream=True,
     )
-    print(resp.choices[0].message.content)
+    for chunk in stream:
+        token = chunk.choices[0].delta.content or "" if chunk.choices else ""
+        if token:
+            yield token
+
+
+def analyze_frames_with_responses(
+    prompt_text: str,
+    transcript: str,
+    jpeg_frames: list[bytes],
+    baby_cues: list[str],
+):
+    """Stream the analysis to stdout as tokens arrive (CLI convenience)."""
+
+    for token in stream_frame_analysis(
+        prompt_text, transcript, jpeg_frames, baby_cues
+    ):
+        print(token, end="", flush=True)
+    print()
 
 
 # === Main workflow ===
-def video_GPT(
+# Completed analyses keyed on video + prompt + segment. diskcache survives
+# process restarts; the dict fallback lives for the process lifetime.
+ANALYSIS_CACHE_TTL_SEC = 86400
+_ANALYSIS_CACHE = (
+    diskcache.Cache("/tmp/babyagent_cache") if diskcache is not None else {}
+)
+
+
+def _analysis_cache_key(
+    video_source: str, start_sec: float, end_sec: Optional[float]
+) -> Optional[str]:
+    """Stable key for a (video, prompt, segment) combination, or None."""
+
+    h = hashlib.sha256()
+    if is_url(video_source):
+        h.update(video_source.encode())
+    else:
+        try:
+            with open(video_source, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+        except OSError:
+            return None
+    h.update(PROMPT_VISION.encode())
+    h.update(f"{start_sec}:{end_sec}".encode())
+    return h.hexdigest()
+
+
+def video_GPT_stream(
     video_path: str = INPUT_VIDEO_PATH,
     start_sec: float = 0.0,
     end_sec: Optional[float] = None,
     cookie_file: Optional[str] = None,
     cookies_from_browser: Optional[Tuple[str, Optional[str]]] = None,
 ):
+    """Run the full pipeline and yield analysis text chunks as they arrive."""
+
+    cache_key = _analysis_cache_key(video_path, start_sec, end_sec)
+    if cache_key is not None:
+        cached = _ANALYSIS_CACHE.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
     local_video_path, temp_dir = prepare_video_input(
         video_path,
         cookie_file=cookie_file,
@@ -443,31 +836,61 @@ def video_GPT(
     cleanup_targets = [temp_dir]
 
     try:
-        extract_frames(
-            local_video_path,
-            interval_sec=0.5,
-            start_sec=start_sec,
-            end_sec=end_sec,
-        )
-        transcript, baby_cues = extract_audio_and_transcribe(local_video_path)
-
-        # Gather all frames and encode to base64
-        base64frames = []
-        for filename in sorted(os.listdir(FRAME_FOLDER)):
-            fp = os.path.join(FRAME_FOLDER, filename)
-            if os.path.isfile(fp) and filename.lower().endswith(
-                (".jpg", ".jpeg", ".png")
-            ):
-                base64frames.append(convert_to_base64(fp))
-
-        analyze_frames_with_responses(
+        # Audio transcription (network-bound) and frame extraction/encoding
+        # (CPU/disk-bound) are independent — run them concurrently so the
+        # wall clock pays only for the slower of the two.
+        with ThreadPoolExecutor(max_workers=1) as audio_pool:
+            audio_future = audio_pool.submit(
+                extract_audio_and_transcribe, local_video_path
+            )
+
+            jpeg_frames = extract_frames(
+                local_video_path,
+                interval_sec=0.5,
+                start_sec=start_sec,
+                end_sec=end_sec,
+            )
+
+            transcript, baby_cues = audio_future.result()
+
+        collected: list[str] = []
+        for token in stream_frame_analysis(
             PROMPT_VISION,
             transcript,
-            base64frames,
+            jpeg_frames,
             baby_cues,
-        )
+        ):
+            collected.append(token)
+            yield token
+
+        if cache_key is not None and collected:
+            analysis_text = "".join(collected)
+            if diskcache is not None:
+                _ANALYSIS_CACHE.set(
+                    cache_key, analysis_text, expire=ANALYSIS_CACHE_TTL_SEC
+                )
+            else:
+                _ANALYSIS_CACHE[cache_key] = analysis_text
     finally:
-        cleanup_paths(cleanup_targets + [FRAME_FOLDER])
+        cleanup_paths(cleanup_targets)
+
+
+def video_GPT(
+    video_path: str = INPUT_VIDEO_PATH,
+    start_sec: float = 0.0,
+    end_sec: Optional[float] = None,
+    cookie_file: Optional[str] = None,
+    cookies_from_browser: Optional[Tuple[str, Optional[str]]] = None,
+):
+    for token in video_GPT_stream(
+        video_path=video_path,
+        start_sec=start_sec,
+        end_sec=end_sec,
+        cookie_file=cookie_file,
+        cookies_from_browser=cookies_from_browser,
+    ):
+        print(token, end="", flush=True)
+    print()
 
 
 def _parse_cli_args():
@@ -4,11 +4,18 @@ Xiaohongshu (RedNote) Content Scraper with Enhanced Debugging
 Scrapes posts and comments based on Chinese keywords
 """
 
+import functools
+import heapq
 import json
+import os
+import queue
+import threading
 import time
+import traceback
 import random
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from typing import List, Dict, Any
-from dataclasses import dataclass, asdict
 import requests
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -22,57 +29,194 @@ from selenium.common.exceptions import (
 )
 from selenium.webdriver.common.keys import Keys
 import logging
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import re
 from urllib.parse import quote
 
-# Configure logging with DEBUG level
+# Log level defaults to INFO; set LOGLEVEL=DEBUG for the verbose firehose.
+# Lazy %-style formatting below keeps disabled levels free of f-string work.
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.environ.get("LOGLEVEL", "INFO"),
     format="%(asctime)s - %(levelname)s - [%(funcName)s] - %(message)s",
 )
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class Comment:
-    """Represents a comment on a post"""
+@functools.lru_cache(maxsize=256)
+def _search_url(base_url: str, keyword: str) -> str:
+    """Build (and memoize) the encoded search URL for a keyword
 
-    comment: str
-    likes: int
+    quote() walks the keyword char-by-char; repeat crawls of the same
+    keyword reuse the finished URL instead.
+    """
+    encoded_keyword = quote(keyword)
+    return (
+        f"{base_url}/search_result"
+        f"?keyword={encoded_keyword}&source=web_search_result_notes"
+    )
 
 
-@dataclass
-class Post:
-    """Represents a Xiaohongshu post"""
+# Precompiled patterns — these run once per scraped element, so skip the
+# re-cache lookup on every call. Patterns match "100", "1.2万", "1.2k", etc.
+_LIKES_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (r"\d+\.?\d*[万wkK]?", r"赞\s*\d+", r"likes?\s*\d+")
+]
+
+# Comment extraction only touches comment-ish nodes, so a strained parse
+# skips building soup objects for the rest of the page DOM
+_COMMENT_STRAINER = SoupStrainer(attrs={"class": re.compile("comment")})
+
+# Selector fallback chains, hoisted so they aren't rebuilt per invocation
+_POST_SELECTORS = (
+    "section.note-item",  # Common selector for note items
+    'div[class*="note-item"]',
+    'a[href*="/explore/"]',
+    "div.cover.ld.mask",
+    'div[class*="feeds-container"] a',
+    ".note-list .note",
+    'article[class*="note"]',
+    'div[data-v-][class*="note"]',
+)
+_POST_FALLBACK_SELECTORS = (
+    'a[href*="/explore/"]',
+    'section[class*="note"] a',
+    "div.feeds-container a",
+)
+_CLOSE_BUTTON_SELECTORS = (
+    "div.close-btn",
+    'button[class*="close"]',
+    'span[class*="close"]',
+    'div[class*="modal-close"]',
+)
+_CONTENT_SELECTORS = (
+    'div[class*="note-text"]',
+    'div[class*="content"]',
+    "div.note-scroller",
+    'span[class*="note-text"]',
+    "#detail-desc",
+    'div[data-v-][class*="desc"]',
+    'meta[name="description"]',  # Sometimes in meta tags
+)
+_AUTHOR_SELECTORS = (
+    'a[class*="author"]',
+    'span[class*="username"]',
+    'div[class*="user-name"]',
+    'a[href*="/user/profile/"]',
+    "div.author-wrapper a",
+    "span.name",
+)
+_COMMENT_SELECTORS = (
+    'div[class*="comment-item"]',
+    'div[class*="comment-content"]',
+    'div[class*="comments-list"] > div',
+    'ul[class*="comments"] li',
+    "div.comment",
+)
+_COMMENT_TEXT_SELECTORS = (
+    '[class*="content"]',
+    '[class*="text"]',
+    "span",
+    "p",
+)
+_COMMENT_LIKES_SELECTORS = (
+    '[class*="like"]',
+    '[class*="count"]',
+    'span[class*="num"]',
+)
+# One execute_script round-trip fetches href + surrounding rendered text
+# for every candidate, instead of 2-3 driver calls per element
+_BATCH_POST_JS = """
+const sel = arguments[0];
+return Array.from(document.querySelectorAll(sel)).map(el => {
+  const a = el.matches('a') ? el : el.querySelector('a[href*=\"/explore/\"]');
+  const scope = el.closest('section,article,div') || el.parentElement || el;
+  return {href: a ? a.href : null, likesText: scope.innerText || ''};
+});
+"""
 
-    post_url: str
-    post_content: str
-    author: str
-    author_profile_page: str
-    comments: List[Dict[str, Any]]
+# One fused DOM walk pulls content, author, and comments per post —
+# replacing ~20 targeted driver round-trips with a single execute_script
+_POST_DETAILS_JS = """
+const q = s => document.querySelector(s);
+const contentEl =
+  q('div[class*=\"note-text\"]') || q('#detail-desc') || q('span[class*=\"note-text\"]');
+const meta = q('meta[name=\"description\"]');
+const content = (contentEl && contentEl.innerText) || (meta && meta.content) || '';
+const authorEl = q('a[href*=\"/user/profile/\"]');
+const comments = Array.from(
+  document.querySelectorAll('div[class*=\"comment-item\"]')
+).map(c => {
+  const textEl = c.querySelector('[class*=\"content\"],[class*=\"text\"],span,p');
+  const likeEl = c.querySelector('[class*=\"like\"],[class*=\"count\"],span[class*=\"num\"]');
+  return {
+    text: textEl ? textEl.innerText : '',
+    likesText: likeEl ? likeEl.innerText : '',
+    replies: c.querySelectorAll('[class*=\"reply\"],[class*=\"sub-comment\"]').length,
+  };
+});
+return {
+  content: content,
+  author: authorEl ? authorEl.innerText : '',
+  profile: authorEl ? authorEl.href : '',
+  comments: comments,
+};
+"""
+
+_SEARCH_BOX_SELECTORS = (
+    'input[placeholder*="搜索"]',
+    'input[type="search"]',
+    'input[class*="search"]',
+    "#search-input",
+)
 
 
 class XiaohongshuScraper:
     """Main scraper class for Xiaohongshu content with enhanced debugging"""
 
-    def __init__(self, headless: bool = False, debug: bool = True):
+    def __init__(
+        self, headless: bool = False, debug: bool = True, max_concurrency: int = 4
+    ):
         """
         Initialize the scraper with Chrome WebDriver
 
         Args:
             headless: Run browser in headless mode (may not work well with XHS)
             debug: Enable debug output
+            max_concurrency: Maximum number of posts scraped in parallel
         """
         self.debug = debug
+        self.headless = headless
+        self.max_concurrency = max_concurrency
+        # Debug screenshots are sampled (multi-MB PNG encode per capture)
+        # and written off-thread so the scrape path never blocks on disk
+        self.screenshot_prob = 0.05
+        self._snapshot_pool = ThreadPoolExecutor(max_workers=1)
+        # Warm secondary drivers kept across scrape_keyword calls so each
+        # batch skips the multi-second Chrome cold start per worker
+        self._extra_drivers: List = []
+        # WebDriverWait instances reused per (driver, timeout) pair
+        self._waits: Dict = {}
+        # Plain-HTTP session for the fast path — 10-100x cheaper than
+        # driving Chrome for pages whose content ships in the initial HTML
+        self._http_session = requests.Session()
+        self._http_session.headers.update(
+            {
+                "User-Agent": (
+                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                    "AppleWebKit/537.36 (KHTML, like Gecko) "
+                    "Chrome/120.0.0.0 Safari/537.36"
+                ),
+                "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+            }
+        )
         self.setup_driver(headless)
         self.base_url = "https://www.xiaohongshu.com"
         self.search_url = f"{self.base_url}/search_result"
-        logger.info(f"Scraper initialized. Base URL: {self.base_url}")
+        logger.info("Scraper initialized. Base URL: %s", self.base_url)
 
-    def setup_driver(self, headless: bool):
-        """Setup Chrome WebDriver with anti-detection measures"""
-        logger.debug("Setting up Chrome WebDriver...")
+    def _build_driver(self, headless: bool):
+        """Build a Chrome WebDriver with anti-detection measures"""
         chrome_options = Options()
 
         # Anti-detection measures
@@ -92,38 +236,169 @@ class XiaohongshuScraper:
         chrome_options.add_argument("--allow-running-insecure-content")
         chrome_options.add_argument("--window-size=1920,1080")
 
+        # Text is all we scrape — skip images, media, and notifications so
+        # each page costs a fraction of the bytes and DOMContentLoaded fires
+        # sooner. Stylesheets stay on: innerText extraction depends on CSS
+        # visibility.
+        chrome_options.add_experimental_option(
+            "prefs",
+            {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            },
+        )
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+
+        # Capture Network.* events so search-API XHR bodies can be read via
+        # CDP instead of scraped out of the DOM
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
         if headless:
             chrome_options.add_argument("--headless=new")  # Use new headless mode
             logger.warning(
                 "Running in headless mode - this may not work well with Xiaohongshu"
             )
 
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.execute_cdp_cmd("Network.enable", {})
+        # Execute CDP commands to mask webdriver
+        driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument",
+            {
+                "source": """
+                Object.defineProperty(navigator, "webdriver", {get: () => undefined});
+                Object.defineProperty(navigator, "plugins", {get: () => [1, 2, 3, 4, 5]});
+                Object.defineProperty(navigator, "languages", {get: () => ["zh-CN", "zh", "en"]});
+            """
+            },
+        )
+        return driver
+
+    def setup_driver(self, headless: bool):
+        """Setup the primary Chrome WebDriver and verify site access"""
+        logger.debug("Setting up Chrome WebDriver...")
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            # Execute CDP commands to mask webdriver
-            self.driver.execute_cdp_cmd(
-                "Page.addScriptToEvaluateOnNewDocument",
-                {
-                    "source": """
-                    Object.defineProperty(navigator, "webdriver", {get: () => undefined});
-                    Object.defineProperty(navigator, "plugins", {get: () => [1, 2, 3, 4, 5]});
-                    Object.defineProperty(navigator, "languages", {get: () => ["zh-CN", "zh", "en"]});
-                """
-                },
-            )
+            self.driver = self._build_driver(headless)
             logger.info("Chrome driver initialized successfully")
 
             # Test if we can access the site
             logger.debug("Testing access to Xiaohongshu...")
-            self.driver.get(self.base_url)
-            time.sleep(3)
-            logger.debug(f"Current URL: {self.driver.current_url}")
-            logger.debug(f"Page title: {self.driver.title}")
+            self.driver.get("https://www.xiaohongshu.com")
+            self._wait_for("body", timeout=10)
+            logger.debug("Current URL: %s", self.driver.current_url)
+            logger.debug("Page title: %s", self.driver.title)
 
         except Exception as e:
-            logger.error(f"Failed to initialize Chrome driver: {e}")
+            logger.error("Failed to initialize Chrome driver: %s", e)
             raise
 
+    def _snapshot(self, name: str, driver=None):
+        """Capture a sampled debug screenshot and write it off-thread"""
+        if not self.debug or random.random() >= self.screenshot_prob:
+            return
+        driver = driver or self.driver
+        try:
+            png = driver.get_screenshot_as_png()
+        except WebDriverException as e:
+            logger.debug("Screenshot capture failed: %s", e)
+            return
+        self._snapshot_pool.submit(self._write_snapshot, name, png)
+
+    @staticmethod
+    def _write_snapshot(name: str, png: bytes):
+        try:
+            with open(name, "wb") as f:
+                f.write(png)
+            logger.debug("Screenshot saved as %s", name)
+        except OSError as e:
+            logger.debug("Screenshot write failed: %s", e)
+
+    def _wait_for(self, css: str, timeout: float = 8, driver=None) -> bool:
+        """Block until a CSS selector is present, returning False on timeout"""
+        driver = driver or self.driver
+        key = (id(driver), timeout)
+        wait = self._waits.get(key)
+        if wait is None:
+            wait = WebDriverWait(driver, timeout)
+            self._waits[key] = wait
+        try:
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, css)))
+            return True
+        except TimeoutException:
+            return False
+
+    def _soup(self, driver=None) -> BeautifulSoup:
+        """Parse the current page once with the C-backed lxml parser
+
+        Every find_element call is a JSON round-trip to chromedriver; pulling
+        page_source once and querying the parsed tree in-process turns
+        O(selectors × elements) round-trips into O(1).
+        """
+        driver = driver or self.driver
+        return BeautifulSoup(driver.page_source, "lxml")
+
+    def _collect_search_api_candidates(self, driver=None) -> List[tuple]:
+        """Harvest search-API responses from the CDP performance log
+
+        The scroll-triggered /api/sns/web/v1/search/notes XHRs already carry
+        post ids and like counts — one JSON blob replaces N DOM queries and
+        the likes-text regex parsing entirely.
+        """
+        driver = driver or self.driver
+        candidates: List[tuple] = []
+        try:
+            entries = driver.get_log("performance")
+        except WebDriverException as e:
+            logger.debug("Performance log unavailable: %s", e)
+            return candidates
+
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+                if message.get("method") != "Network.responseReceived":
+                    continue
+                response = message["params"]["response"]
+                if "/api/sns/web/v1/search/notes" not in response.get("url", ""):
+                    continue
+                body = driver.execute_cdp_cmd(
+                    "Network.getResponseBody",
+                    {"requestId": message["params"]["requestId"]},
+                )
+                payload = json.loads(body.get("body") or "{}")
+                for item in (payload.get("data") or {}).get("items") or []:
+                    note_id = item.get("id")
+                    if not note_id:
+                        continue
+                    note_card = item.get("note_card") or {}
+                    liked = (note_card.get("interact_info") or {}).get(
+                        "liked_count"
+                    ) or "0"
+                    candidates.append(
+                        (f"{self.base_url}/explore/{note_id}", str(liked))
+                    )
+            except (KeyError, ValueError, WebDriverException) as e:
+                logger.debug("Skipping unparsable performance entry: %s", e)
+                continue
+
+        return candidates
+
+    def _canonical_post_url(self, href: str):
+        """Normalize an /explore/ href to (post_id, canonical URL)
+
+        Search pages surface the same post under several selectors and
+        query-string variants; keying on the id lets callers dedupe.
+        """
+        post_id = href.rsplit("/", 1)[-1].split("?")[0]
+        if not post_id:
+            return None, None
+        return post_id, f"{self.base_url}/explore/{post_id}"
+
+    def _absolutize(self, href: str) -> str:
+        """Make a scraped href absolute against the site base URL"""
+        if href.startswith("/"):
+            return f"{self.base_url}{href}"
+        return href
+
     def search_posts(
         self, keyword: str, min_likes: int = 100, max_posts: int = 20
     ) -> List[str]:
@@ -142,45 +417,41 @@ class XiaohongshuScraper:
 
         try:
             # Method 1: Try direct search URL
-            encoded_keyword = quote(keyword)
-            search_query = f"{self.base_url}/search_result?keyword={encoded_keyword}&source=web_search_result_notes"
-            logger.info(f"Navigating to search URL: {search_query}")
+            search_query = _search_url(self.base_url, keyword)
+            logger.info("Navigating to search URL: %s", search_query)
 
             self.driver.get(search_query)
-            time.sleep(random.uniform(5, 7))
+            # Wait for the result nodes we actually need, not a fixed pause
+            if not self._wait_for(
+                'section.note-item, a[href*="/explore/"]', timeout=10
+            ):
+                logger.warning("Search results did not appear within 10s")
+            time.sleep(random.uniform(0.2, 0.6))  # small anti-bot jitter
 
-            # Debug: Save screenshot
-            self.driver.save_screenshot("debug_search_page.png")
-            logger.debug("Screenshot saved as debug_search_page.png")
+            # Debug: Save screenshot (sampled, written off-thread)
+            self._snapshot("debug_search_page.png")
 
             # Debug: Print page source snippet
             page_source = self.driver.page_source
-            logger.debug(f"Page source length: {len(page_source)}")
+            logger.debug("Page source length: %s", len(page_source))
 
             # Check if we need to handle any popups or login prompts
             self.handle_popups()
 
-            # Multiple selector strategies for finding posts
-            post_selectors = [
-                "section.note-item",  # Common selector for note items
-                'div[class*="note-item"]',
-                'a[href*="/explore/"]',
-                "div.cover.ld.mask",
-                'div[class*="feeds-container"] a',
-                ".note-list .note",
-                'article[class*="note"]',
-                'div[data-v-][class*="note"]',
-            ]
-
+            soup = self._soup()
             posts_found = False
-            for selector in post_selectors:
-                logger.debug(f"Trying selector: {selector}")
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            elements = []
+            matched_selector = None
+            for selector in _POST_SELECTORS:
+                logger.debug("Trying selector: %s", selector)
+                elements = soup.select(selector)
                 if elements:
                     logger.info(
-                        f"Found {len(elements)} elements with selector: {selector}"
+                        "Found %s elements with selector: %s",
+                        len(elements), selector,
                     )
                     posts_found = True
+                    matched_selector = selector
                     break
 
             if not posts_found:
@@ -192,81 +463,113 @@ class XiaohongshuScraper:
                     )
                     time.sleep(2)
 
-                # Try again after scrolling
-                for selector in post_selectors:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                # Try again after scrolling, against a fresh parse
+                soup = self._soup()
+                for selector in _POST_SELECTORS:
+                    elements = soup.select(selector)
                     if elements:
                         logger.info(
-                            f"Found {len(elements)} elements after scrolling with selector: {selector}"
+                            "Found %s elements after scrolling with selector: %s",
+                            len(elements), selector,
                         )
+                        matched_selector = selector
                         break
 
-            # If still no elements, try XPath
+            # If still no elements, try broader anchor fallbacks
             if not elements:
-                xpath_selectors = [
-                    '//a[contains(@href, "/explore/")]',
-                    '//section[contains(@class, "note")]//a',
-                    '//div[@class="feeds-container"]//a',
-                ]
-
-                for xpath in xpath_selectors:
-                    logger.debug(f"Trying XPath: {xpath}")
-                    elements = self.driver.find_elements(By.XPATH, xpath)
+                for selector in _POST_FALLBACK_SELECTORS:
+                    logger.debug("Trying fallback selector: %s", selector)
+                    elements = soup.select(selector)
                     if elements:
                         logger.info(
-                            f"Found {len(elements)} elements with XPath: {xpath}"
+                            "Found %s elements with fallback selector: %s",
+                            len(elements), selector,
                         )
+                        matched_selector = selector
                         break
 
-            # Process found elements
-            for element in elements:
+            # Prefer post ids + like counts captured straight from the
+            # search API's XHR responses via CDP
+            candidates = self._collect_search_api_candidates()
+            if candidates:
+                logger.info(
+                    "Using %s candidates from captured search API responses",
+                    len(candidates),
+                )
+
+            # Batch-fetch href + rendered likes text for every candidate in
+            # one driver round-trip; fall back to the parsed tree if it fails
+            if not candidates and matched_selector and elements:
+                try:
+                    rows = (
+                        self.driver.execute_script(
+                            _BATCH_POST_JS, matched_selector
+                        )
+                        or []
+                    )
+                    candidates = [
+                        (row.get("href"), row.get("likesText") or "")
+                        for row in rows
+                    ]
+                except WebDriverException as e:
+                    logger.debug("Batch attribute fetch failed: %s", e)
+
+            if not candidates:
+                for element in elements:
+                    anchor = (
+                        element
+                        if element.name == "a"
+                        else element.select_one('a[href*="/explore/"]')
+                    )
+                    href = anchor.get("href") if anchor is not None else None
+                    parent = element.parent
+                    likes_blob = (
+                        parent.get_text(" ", strip=True)
+                        if parent is not None
+                        else ""
+                    )
+                    candidates.append((href, likes_blob))
+
+            # Process candidates, deduping on the canonical post id
+            seen_post_ids = set()
+            for href, likes_blob in candidates:
                 if len(post_urls) >= max_posts:
                     break
 
                 try:
-                    # Get the href attribute
-                    href = element.get_attribute("href")
                     if not href or "/explore/" not in href:
                         continue
+                    post_id, href = self._canonical_post_url(href)
+                    if not post_id or post_id in seen_post_ids:
+                        continue
+                    seen_post_ids.add(post_id)
 
-                    logger.debug(f"Found potential post URL: {href}")
+                    logger.debug("Found potential post URL: %s", href)
 
-                    # Try to find likes count - multiple strategies
+                    # Extract a likes figure from the surrounding text
                     likes_count = 0
-
-                    # Strategy 1: Look for likes in parent element
-                    parent = element.find_element(By.XPATH, "..")
-                    likes_text = self.extract_likes_from_element(parent)
+                    likes_text = self.extract_likes_from_text(likes_blob)
                     if likes_text:
                         likes_count = self.parse_likes(likes_text)
 
-                    # Strategy 2: Look for specific likes element
-                    if likes_count == 0:
-                        try:
-                            likes_elem = parent.find_element(
-                                By.CSS_SELECTOR,
-                                'span[class*="like"], span[class*="count"]',
-                            )
-                            likes_count = self.parse_likes(likes_elem.text)
-                        except:
-                            pass
-
                     # For debugging, accept all posts if we can't find likes
                     if self.debug and likes_count == 0:
                         logger.warning(
-                            f"Could not find likes for {href}, including it anyway in debug mode"
+                            "Could not find likes for %s, including it anyway in debug mode",
+                            href,
                         )
                         post_urls.append(href)
                     elif likes_count >= min_likes:
                         post_urls.append(href)
-                        logger.info(f"Added post with {likes_count} likes: {href}")
+                        logger.info("Added post with %s likes: %s", likes_count, href)
                     else:
                         logger.debug(
-                            f"Skipped post with {likes_count} likes (min: {min_likes})"
+                            "Skipped post with %s likes (min: %s)",
+                            likes_count, min_likes,
                         )
 
                 except Exception as e:
-                    logger.debug(f"Error processing element: {e}")
+                    logger.debug("Error processing element: %s", e)
                     continue
 
             # If no posts found, try alternative search method
@@ -277,48 +580,36 @@ class XiaohongshuScraper:
                 post_urls = self.alternative_search(keyword, min_likes, max_posts)
 
         except Exception as e:
-            logger.error(f"Error in search_posts: {e}")
-            import traceback
-
+            logger.error("Error in search_posts: %s", e)
             logger.error(traceback.format_exc())
 
-        logger.info(f"Total posts found: {len(post_urls)}")
+        logger.info("Total posts found: %s", len(post_urls))
         return post_urls
 
-    def handle_popups(self):
+    def handle_popups(self, driver=None):
         """Handle any popups or modals that might appear"""
+        driver = driver or self.driver
+        # Close cookie consent, login prompts, etc. find_elements returns []
+        # on a miss, so selector misses cost no exception raise.
+        for selector in _CLOSE_BUTTON_SELECTORS:
+            buttons = driver.find_elements(By.CSS_SELECTOR, selector)
+            if not buttons:
+                continue
+            try:
+                buttons[0].click()
+                logger.debug("Closed popup with selector: %s", selector)
+                time.sleep(1)
+            except WebDriverException as e:
+                logger.debug("Popup close failed for %s: %s", selector, e)
+
+    def extract_likes_from_text(self, text):
+        """Extract likes text from a blob of element text"""
         try:
-            # Close cookie consent, login prompts, etc.
-            close_buttons = [
-                "div.close-btn",
-                'button[class*="close"]',
-                'span[class*="close"]',
-                'div[class*="modal-close"]',
-            ]
-
-            for selector in close_buttons:
-                try:
-                    close_btn = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    close_btn.click()
-                    logger.debug(f"Closed popup with selector: {selector}")
-                    time.sleep(1)
-                except:
-                    pass
-        except:
-            pass
-
-    def extract_likes_from_element(self, element):
-        """Extract likes text from an element"""
-        try:
-            # Look for text containing numbers
-            text = element.text
-            # Look for patterns like "100", "1.2万", "1.2k"
-            patterns = [r"\d+\.?\d*[万wkK]?", r"赞\s*\d+", r"likes?\s*\d+"]
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
+            for pattern in _LIKES_PATTERNS:
+                match = pattern.search(text)
                 if match:
                     return match.group()
-        except:
+        except TypeError:
             pass
         return None
 
@@ -332,75 +623,100 @@ class XiaohongshuScraper:
         try:
             # Go to home page first
             self.driver.get(self.base_url)
-            time.sleep(3)
+            self._wait_for("body", timeout=10)
 
             # Look for search box and enter keyword
-            search_selectors = [
-                'input[placeholder*="搜索"]',
-                'input[type="search"]',
-                'input[class*="search"]',
-                "#search-input",
-            ]
-
             search_box = None
-            for selector in search_selectors:
-                try:
-                    search_box = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    logger.debug(f"Found search box with selector: {selector}")
+            for selector in _SEARCH_BOX_SELECTORS:
+                boxes = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                if boxes:
+                    search_box = boxes[0]
+                    logger.debug("Found search box with selector: %s", selector)
                     break
-                except:
-                    continue
 
             if search_box:
                 search_box.clear()
                 search_box.send_keys(keyword)
                 search_box.send_keys(Keys.RETURN)
-                time.sleep(5)
-
-                # Now look for posts again
-                elements = self.driver.find_elements(
-                    By.CSS_SELECTOR, 'a[href*="/explore/"]'
-                )
-                for element in elements[:max_posts]:
-                    href = element.get_attribute("href")
-                    if href:
-                        post_urls.append(href)
+                self._wait_for('a[href*="/explore/"]', timeout=8)
+
+                # Now look for posts again — one parse, zero per-element
+                # driver round-trips, deduped on the canonical post id
+                soup = self._soup()
+                seen_post_ids = set()
+                for anchor in soup.select('a[href*="/explore/"]'):
+                    href = anchor.get("href")
+                    if not href:
+                        continue
+                    post_id, canonical = self._canonical_post_url(href)
+                    if not post_id or post_id in seen_post_ids:
+                        continue
+                    seen_post_ids.add(post_id)
+                    post_urls.append(canonical)
+                    if len(post_urls) >= max_posts:
+                        break
 
         except Exception as e:
-            logger.error(f"Alternative search failed: {e}")
+            logger.error("Alternative search failed: %s", e)
 
         return post_urls
 
     def parse_likes(self, likes_text: str) -> int:
-        """Parse likes count from text (handles 万 for 10k)"""
+        """Parse likes count from text (handles 万/w for 10k and k for 1000)"""
         if not likes_text:
             return 0
 
-        likes_text = likes_text.strip()
-
-        if "万" in likes_text:
-            num = float(likes_text.replace("万", ""))
-            return int(num * 10000)
-        elif "w" in likes_text.lower():
-            num = float(likes_text.lower().replace("w", ""))
-            return int(num * 10000)
-        else:
-            # Extract numbers from string
-            numbers = re.findall(r"\d+", likes_text)
-            if numbers:
-                return int(numbers[0])
-        return 0
+        # Single left-to-right scan: skip leading junk (e.g. "赞 "),
+        # accumulate integer and fractional digits, and apply a multiplier
+        # iff a 万/w/k suffix terminates the number. No regex engine or
+        # intermediate strings — this runs once per post and per comment.
+        int_part = 0
+        frac_part = 0
+        frac_scale = 1
+        in_fraction = False
+        seen_digit = False
+        multiplier = 1
+        for ch in likes_text:
+            if ch.isdigit():
+                seen_digit = True
+                if in_fraction:
+                    frac_part = frac_part * 10 + int(ch)
+                    frac_scale *= 10
+                else:
+                    int_part = int_part * 10 + int(ch)
+            elif ch == "." and seen_digit and not in_fraction:
+                in_fraction = True
+            elif seen_digit:
+                if ch in "万wW":
+                    multiplier = 10000
+                elif ch in "kK":
+                    multiplier = 1000
+                break
+
+        if not seen_digit:
+            return 0
+        return (int_part * frac_scale + frac_part) * multiplier // frac_scale
 
-    def scrape_post_details(self, post_url: str) -> Dict[str, Any]:
+    def scrape_post_details(self, post_url: str, driver=None) -> Dict[str, Any]:
         """
         Scrape detailed information from a single post
 
         Args:
             post_url: URL of the post to scrape
+            driver: WebDriver to use (defaults to the primary driver)
 
         Returns:
             Dictionary containing post details
         """
+        driver = driver or self.driver
+
+        # Fast path: the initial HTML often carries content + author, and a
+        # plain GET is far cheaper than a browser navigation
+        http_post = self._scrape_post_via_http(post_url)
+        if http_post is not None:
+            logger.info("Scraped post via HTTP fast path: %s", post_url)
+            return http_post
+
         post_data = {
             "post_url": post_url,
             "post_content": "",
@@ -410,50 +726,56 @@ class XiaohongshuScraper:
         }
 
         try:
-            logger.info(f"Scraping post: {post_url}")
-            self.driver.get(post_url)
-            time.sleep(random.uniform(4, 6))
+            logger.info("Scraping post: %s", post_url)
+            driver.get(post_url)
+            # Wait for the content node we actually need, not a fixed pause
+            if not self._wait_for(
+                'div[class*="note-text"], meta[name="description"]',
+                timeout=8,
+                driver=driver,
+            ):
+                logger.debug("Post content selector did not appear within 8s")
+            time.sleep(random.uniform(0.2, 0.6))  # small anti-bot jitter
 
             # Handle any popups
-            self.handle_popups()
+            self.handle_popups(driver)
 
-            # Debug: Save screenshot
-            if self.debug:
-                self.driver.save_screenshot(f"debug_post_{post_url.split('/')[-1]}.png")
+            # Debug: Save screenshot (sampled, written off-thread)
+            self._snapshot(
+                f"debug_post_{post_url.split('/')[-1]}.png", driver=driver
+            )
 
-            # Wait for content to load
-            wait = WebDriverWait(self.driver, 10)
+            # Fused fast path: one JS call returns every field at once
+            fused = self._scrape_post_fused(driver)
+            if fused is not None:
+                post_data.update(fused)
+                logger.info(
+                    "Successfully scraped post. Content length: %s, Comments: %s",
+                    len(post_data["post_content"]), len(post_data["comments"]),
+                )
+                return post_data
 
-            # Get post content - try multiple selectors
-            content_selectors = [
-                'div[class*="note-text"]',
-                'div[class*="content"]',
-                "div.note-scroller",
-                'span[class*="note-text"]',
-                "#detail-desc",
-                'div[data-v-][class*="desc"]',
-                'meta[name="description"]',  # Sometimes in meta tags
-            ]
-
-            for selector in content_selectors:
-                try:
-                    if selector.startswith("meta"):
-                        element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        post_data["post_content"] = element.get_attribute("content")
-                    else:
-                        element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        post_data["post_content"] = element.text
+            # Parse the loaded page once and query it in-process
+            soup = self._soup(driver)
 
-                    if post_data["post_content"]:
-                        logger.debug(f"Found content with selector: {selector}")
-                        break
-                except:
+            # Get post content - try multiple selectors
+            for selector in _CONTENT_SELECTORS:
+                element = soup.select_one(selector)
+                if element is None:
                     continue
+                if selector.startswith("meta"):
+                    post_data["post_content"] = element.get("content", "")
+                else:
+                    post_data["post_content"] = element.get_text(strip=True)
+
+                if post_data["post_content"]:
+                    logger.debug("Found content with selector: %s", selector)
+                    break
 
             # If still no content, try JavaScript extraction
             if not post_data["post_content"]:
                 try:
-                    content = self.driver.execute_script(
+                    content = driver.execute_script(
                         """
                         var desc = document.querySelector('[class*="desc"]');
                         if (desc) return desc.innerText;
@@ -465,62 +787,348 @@ class XiaohongshuScraper:
                     if content:
                         post_data["post_content"] = content
                         logger.debug("Found content with JavaScript extraction")
-                except:
-                    pass
+                except WebDriverException as e:
+                    logger.debug("JavaScript content extraction failed: %s", e)
 
             # Get author information - try multiple selectors
-            author_selectors = [
-                'a[class*="author"]',
-                'span[class*="username"]',
-                'div[class*="user-name"]',
-                'a[href*="/user/profile/"]',
-                "div.author-wrapper a",
-                "span.name",
-            ]
-
-            for selector in author_selectors:
-                try:
-                    element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    post_data["author"] = (
-                        element.text
-                        or element.get_attribute("title")
-                        or element.get_attribute("alt")
-                    )
+            for selector in _AUTHOR_SELECTORS:
+                element = soup.select_one(selector)
+                if element is None:
+                    continue
+                post_data["author"] = (
+                    element.get_text(strip=True)
+                    or element.get("title")
+                    or element.get("alt")
+                    or ""
+                )
 
-                    # Try to get profile link
-                    if element.tag_name == "a":
-                        post_data["author_profile_page"] = element.get_attribute("href")
-                    else:
-                        # Look for parent link
-                        parent_link = element.find_element(By.XPATH, "./ancestor::a")
-                        post_data["author_profile_page"] = parent_link.get_attribute(
-                            "href"
-                        )
+                # Try to get profile link from the element or an ancestor
+                link = element if element.name == "a" else element.find_parent("a")
+                if link is not None and link.get("href"):
+                    post_data["author_profile_page"] = self._absolutize(
+                        link["href"]
+                    )
 
-                    if post_data["author"]:
-                        logger.debug(f"Found author with selector: {selector}")
-                        break
-                except:
-                    continue
+                if post_data["author"]:
+                    logger.debug("Found author with selector: %s", selector)
+                    break
 
             # Get comments
             logger.debug("Scraping comments...")
-            post_data["comments"] = self.scrape_comments()
+            post_data["comments"] = self.scrape_comments(driver=driver)
 
             logger.info(
-                f"Successfully scraped post. Content length: {len(post_data['post_content'])}, Comments: {len(post_data['comments'])}"
+                "Successfully scraped post. Content length: %s, Comments: %s",
+                len(post_data['post_content']), len(post_data['comments']),
             )
 
         except Exception as e:
-            logger.error(f"Error scraping post {post_url}: {e}")
-            import traceback
-
+            logger.error("Error scraping post %s: %s", post_url, e)
             logger.error(traceback.format_exc())
 
         return post_data
 
+    def _capture_comment_api_template(self, driver):
+        """Record the signed comment-API request (url + headers) via CDP
+
+        The browser signs each /api/sns/web/v2/comment/page request with
+        x-s/x-t headers; replaying the captured request over plain HTTP
+        costs tens of ms instead of a scroll + render cycle.
+
+        Returns the template captured from this driver's page, or None.
+        Returned to the caller rather than stored on the instance so
+        concurrent pool threads can never read a signature captured for a
+        different post.
+        """
+        template = None
+        try:
+            entries = driver.get_log("performance")
+        except WebDriverException as e:
+            logger.debug("Performance log unavailable: %s", e)
+            return None
+
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+                if message.get("method") != "Network.requestWillBeSent":
+                    continue
+                request = message["params"]["request"]
+                url = request.get("url", "")
+                if "/api/sns/web/v2/comment/page" not in url:
+                    continue
+                wanted = ("x-s", "x-t", "x-s-common", "user-agent", "referer")
+                template = {
+                    "url": url,
+                    "headers": {
+                        k: v
+                        for k, v in (request.get("headers") or {}).items()
+                        if k.lower() in wanted
+                    },
+                }
+                # Keep the earliest matching request: the scroll/show-more
+                # that precedes this capture can fire a page-2+ XHR whose
+                # cursor has already advanced past the top comments.
+                break
+            except (KeyError, ValueError):
+                continue
+
+        return template
+
+    def _fetch_comments_via_api(
+        self,
+        template,
+        min_likes: int = 2,
+        max_comments: int = 10,
+        max_pages: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """Page the captured comment API over plain HTTP, no browser"""
+        if not template:
+            return []
+
+        comments: List[Dict[str, Any]] = []
+        url = template["url"]
+        headers = template["headers"]
+        cursor = None
+        for _ in range(max_pages):
+            if cursor:
+                # Swap the cursor into the signed query, appending the
+                # parameter when the captured URL didn't carry one; if the
+                # URL comes out unchanged (same cursor again), stop rather
+                # than refetch the same page.
+                if "cursor=" in url:
+                    next_url = re.sub(r"cursor=[^&]*", f"cursor={cursor}", url)
+                else:
+                    separator = "&" if "?" in url else "?"
+                    next_url = f"{url}{separator}cursor={cursor}"
+                if next_url == url:
+                    break
+                url = next_url
+            try:
+                resp = self._http_session.get(url, headers=headers, timeout=10)
+            except requests.RequestException as e:
+                logger.debug("Comment API fetch failed: %s", e)
+                break
+            if resp.status_code != 200:
+                # Signature likely expired — let the DOM path serve this
+                # post; the next post captures a fresh signature anyway
+                logger.debug(
+                    "Comment API returned %s; dropping signature", resp.status_code
+                )
+                break
+
+            try:
+                data = resp.json().get("data") or {}
+            except ValueError:
+                break
+            for comment in data.get("comments") or []:
+                text = comment.get("content") or ""
+                likes = self.parse_likes(str(comment.get("like_count") or "0"))
+                replies = len(comment.get("sub_comments") or [])
+                if text and (
+                    likes >= min_likes
+                    or replies >= 2
+                    or (self.debug and len(comments) < 3)
+                ):
+                    comments.append({"comment": text[:500], "likes": likes})
+
+            cursor = data.get("cursor")
+            if not data.get("has_more") or not cursor:
+                break
+
+        return heapq.nlargest(max_comments, comments, key=itemgetter("likes"))
+
+    def _parse_comments(
+        self, soup: BeautifulSoup, min_likes: int = 2, max_comments: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Extract comments from a parsed page (shared by HTTP and browser paths)"""
+        comments: List[Dict[str, Any]] = []
+
+        comment_elements = []
+        for selector in _COMMENT_SELECTORS:
+            comment_elements = soup.select(selector)
+            if comment_elements:
+                logger.debug(
+                    "Found %s comments with selector: %s",
+                    len(comment_elements), selector,
+                )
+                break
+
+        for element in comment_elements:
+            try:
+                # Get comment text - try multiple selectors
+                comment_text = ""
+                for selector in _COMMENT_TEXT_SELECTORS:
+                    text_elem = element.select_one(selector)
+                    if text_elem is not None:
+                        comment_text = text_elem.get_text(strip=True)
+                        if comment_text:
+                            break
+
+                if not comment_text:
+                    continue
+
+                # Get likes count
+                likes_count = 0
+                for selector in _COMMENT_LIKES_SELECTORS:
+                    likes_elem = element.select_one(selector)
+                    if likes_elem is not None:
+                        likes_count = self.parse_likes(likes_elem.get_text())
+                        if likes_count > 0:
+                            break
+
+                # Check if comment has replies
+                has_replies = False
+                replies = element.select('[class*="reply"], [class*="sub-comment"]')
+                if len(replies) >= 2:
+                    has_replies = True
+                    logger.debug("Comment has %s replies", len(replies))
+
+                # Include comment if it meets criteria
+                if (
+                    likes_count >= min_likes
+                    or has_replies
+                    or (self.debug and len(comments) < 3)
+                ):
+                    comments.append(
+                        {
+                            "comment": comment_text[:500],  # Limit length
+                            "likes": likes_count,
+                        }
+                    )
+                    logger.debug("Added comment with %s likes", likes_count)
+
+            except Exception as e:
+                logger.debug("Error processing comment: %s", e)
+                continue
+
+        # Keep only the top-liked comments: O(n log k) beats a full sort
+        return heapq.nlargest(max_comments, comments, key=itemgetter("likes"))
+
+    def _sync_http_cookies(self):
+        """Copy the browser's cookies onto the HTTP session"""
+        try:
+            for cookie in self.driver.get_cookies():
+                self._http_session.cookies.set(
+                    cookie["name"], cookie["value"], domain=cookie.get("domain")
+                )
+        except WebDriverException as e:
+            logger.debug("Cookie sync failed: %s", e)
+
+    def _scrape_post_via_http(self, post_url: str):
+        """Try to scrape a post from its server-rendered HTML, no browser
+
+        Returns the post dict, or None when the static HTML lacks the
+        needed fields and the browser path must take over.
+        """
+        try:
+            resp = self._http_session.get(post_url, timeout=10)
+        except requests.RequestException as e:
+            logger.debug("HTTP fetch failed for %s: %s", post_url, e)
+            return None
+        if resp.status_code != 200 or not resp.text:
+            return None
+
+        soup = BeautifulSoup(resp.text, "lxml")
+
+        content = ""
+        meta = soup.select_one('meta[name="description"]')
+        if meta is not None:
+            content = meta.get("content", "")
+        if not content:
+            for selector in _CONTENT_SELECTORS:
+                element = soup.select_one(selector)
+                if element is not None:
+                    content = element.get_text(strip=True)
+                    if content:
+                        break
+
+        author = ""
+        author_profile_page = ""
+        link = soup.select_one('a[href*="/user/profile/"]')
+        if link is not None:
+            author = (
+                link.get_text(strip=True)
+                or link.get("title")
+                or link.get("alt")
+                or ""
+            )
+            if link.get("href"):
+                author_profile_page = self._absolutize(link["href"])
+
+        if not content or not author:
+            return None
+
+        comment_soup = BeautifulSoup(
+            resp.text, "lxml", parse_only=_COMMENT_STRAINER
+        )
+        return {
+            "post_url": post_url,
+            "post_content": content,
+            "author": author,
+            "author_profile_page": author_profile_page,
+            "comments": self._parse_comments(comment_soup),
+        }
+
+    def _expand_comments(self, driver):
+        """Click 'show more comments' when present so parsing sees the
+        expanded set"""
+        more_buttons = driver.find_elements(
+            By.CSS_SELECTOR, '[class*="show-more"], [class*="load-more"]'
+        )
+        if more_buttons:
+            try:
+                more_buttons[0].click()
+                time.sleep(2)
+                logger.debug("Clicked 'show more comments'")
+            except WebDriverException as e:
+                logger.debug("'Show more comments' click failed: %s", e)
+
+    def _scrape_post_fused(
+        self, driver, min_likes: int = 2, max_comments: int = 10
+    ):
+        """Extract content, author, and comments in one fused DOM walk
+
+        Returns the field dict, or None so the caller can fall back to the
+        selector cascades.
+        """
+        # Bring the comment section into the DOM and expand it, like the
+        # scrape_comments path does, before the single DOM walk
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        self._wait_for('[class*="comment"]', timeout=5, driver=driver)
+        self._expand_comments(driver)
+
+        try:
+            data = driver.execute_script(_POST_DETAILS_JS)
+        except WebDriverException as e:
+            logger.debug("Fused extraction failed: %s", e)
+            return None
+        if not data or not data.get("content"):
+            return None
+
+        comments: List[Dict[str, Any]] = []
+        for row in data.get("comments") or []:
+            text = (row.get("text") or "").strip()
+            if not text:
+                continue
+            likes = self.parse_likes(row.get("likesText") or "")
+            if (
+                likes >= min_likes
+                or (row.get("replies") or 0) >= 2
+                or (self.debug and len(comments) < 3)
+            ):
+                comments.append({"comment": text[:500], "likes": likes})
+
+        return {
+            "post_content": data.get("content") or "",
+            "author": data.get("author") or "",
+            "author_profile_page": data.get("profile") or "",
+            "comments": heapq.nlargest(
+                max_comments, comments, key=itemgetter("likes")
+            ),
+        }
+
     def scrape_comments(
-        self, min_likes: int = 2, max_comments: int = 10
+        self, min_likes: int = 2, max_comments: int = 10, driver=None
     ) -> List[Dict[str, Any]]:
         """
         Scrape comments from the current post page
@@ -528,132 +1136,108 @@ class XiaohongshuScraper:
         Args:
             min_likes: Minimum likes for a comment to be included
             max_comments: Maximum number of comments to return
+            driver: WebDriver to use (defaults to the primary driver)
 
         Returns:
             List of comment dictionaries
         """
+        driver = driver or self.driver
         comments = []
 
         try:
             # Scroll to load comments section
-            self.driver.execute_script(
+            driver.execute_script(
                 "window.scrollTo(0, document.body.scrollHeight);"
             )
-            time.sleep(random.uniform(2, 3))
+            self._wait_for('[class*="comment"]', timeout=5, driver=driver)
+            time.sleep(random.uniform(0.2, 0.6))  # small anti-bot jitter
 
             # Try to click "show more comments" if exists
-            try:
-                more_comments = self.driver.find_element(
-                    By.CSS_SELECTOR, '[class*="show-more"], [class*="load-more"]'
-                )
-                more_comments.click()
-                time.sleep(2)
-                logger.debug("Clicked 'show more comments'")
-            except:
-                pass
-
-            # Find comment elements - try multiple selectors
-            comment_selectors = [
-                'div[class*="comment-item"]',
-                'div[class*="comment-content"]',
-                'div[class*="comments-list"] > div',
-                'ul[class*="comments"] li',
-                "div.comment",
-            ]
-
-            comment_elements = []
-            for selector in comment_selectors:
-                comment_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if comment_elements:
-                    logger.debug(
-                        f"Found {len(comment_elements)} comments with selector: {selector}"
-                    )
-                    break
-
-            for element in comment_elements:
-                try:
-                    # Get comment text - try multiple selectors
-                    comment_text = ""
-                    text_selectors = [
-                        '[class*="content"]',
-                        '[class*="text"]',
-                        "span",
-                        "p",
-                    ]
-
-                    for selector in text_selectors:
-                        try:
-                            text_elem = element.find_element(By.CSS_SELECTOR, selector)
-                            comment_text = text_elem.text
-                            if comment_text:
-                                break
-                        except:
-                            continue
-
-                    if not comment_text:
-                        continue
-
-                    # Get likes count
-                    likes_count = 0
-                    likes_selectors = [
-                        '[class*="like"]',
-                        '[class*="count"]',
-                        'span[class*="num"]',
-                    ]
+            self._expand_comments(driver)
 
-                    for selector in likes_selectors:
-                        try:
-                            likes_elem = element.find_element(By.CSS_SELECTOR, selector)
-                            likes_count = self.parse_likes(likes_elem.text)
-                            if likes_count > 0:
-                                break
-                        except:
-                            continue
-
-                    # Check if comment has replies
-                    has_replies = False
-                    try:
-                        replies = element.find_elements(
-                            By.CSS_SELECTOR, '[class*="reply"], [class*="sub-comment"]'
-                        )
-                        if len(replies) >= 2:
-                            has_replies = True
-                            logger.debug(f"Comment has {len(replies)} replies")
-                    except:
-                        pass
-
-                    # Include comment if it meets criteria
-                    if (
-                        likes_count >= min_likes
-                        or has_replies
-                        or (self.debug and len(comments) < 3)
-                    ):
-                        comments.append(
-                            {
-                                "comment": comment_text[:500],  # Limit length
-                                "likes": likes_count,
-                            }
-                        )
-                        logger.debug(f"Added comment with {likes_count} likes")
-
-                except Exception as e:
-                    logger.debug(f"Error processing comment: {e}")
-                    continue
-
-            # Sort by likes and limit to max_comments
-            comments.sort(key=lambda x: x["likes"], reverse=True)
-            comments = comments[:max_comments]
+            # Record the signed comment XHR the scroll just fired; if we
+            # hold a signature, page the API over HTTP instead of the DOM
+            template = self._capture_comment_api_template(driver)
+            comments = self._fetch_comments_via_api(
+                template, min_likes, max_comments
+            )
+            if comments:
+                logger.info("Fetched %s comments via the comment API", len(comments))
+                return comments
+
+            # Parse only the comment-ish subtrees of the scrolled page and
+            # extract comments in-process
+            soup = BeautifulSoup(
+                driver.page_source, "lxml", parse_only=_COMMENT_STRAINER
+            )
+            comments = self._parse_comments(soup, min_likes, max_comments)
 
-            logger.info(f"Scraped {len(comments)} comments meeting criteria")
+            logger.info("Scraped %s comments meeting criteria", len(comments))
 
         except Exception as e:
-            logger.error(f"Error scraping comments: {e}")
-            import traceback
-
+            logger.error("Error scraping comments: %s", e)
             logger.error(traceback.format_exc())
 
         return comments
 
+    def _scrape_posts_concurrently(
+        self, post_urls: List[str], on_result=None
+    ) -> List[Dict[str, Any]]:
+        """
+        Scrape post URLs in parallel across a bounded pool of drivers
+
+        Each worker checks a driver out of the pool, scrapes one post, and
+        returns the driver, so n×(nav+wait) becomes roughly
+        max(nav+wait)×ceil(n/concurrency). Results keep the input order;
+        on_result (if given) is invoked with each post as it completes.
+        """
+        if not post_urls:
+            return []
+
+        # Let the HTTP fast path present the same cookies as the browser
+        self._sync_http_cookies()
+
+        workers = min(self.max_concurrency, len(post_urls))
+        if workers <= 1:
+            results = []
+            for i, url in enumerate(post_urls, 1):
+                logger.info("Scraping post %s/%s: %s", i, len(post_urls), url)
+                post_data = self.scrape_post_details(url)
+                results.append(post_data)
+                if on_result is not None:
+                    on_result(post_data)
+                # Small anti-bot jitter between requests
+                time.sleep(random.uniform(0.2, 0.6))
+            return results
+
+        # Top the warm pool up to the needed size; drivers stay alive
+        # between batches and are only quit in close().
+        while len(self._extra_drivers) < workers - 1:
+            self._extra_drivers.append(self._build_driver(self.headless))
+
+        driver_pool: queue.Queue = queue.Queue()
+        driver_pool.put(self.driver)
+        for driver in self._extra_drivers[: workers - 1]:
+            driver_pool.put(driver)
+
+        def scrape_one(url: str) -> Dict[str, Any]:
+            driver = driver_pool.get()
+            try:
+                data = self.scrape_post_details(url, driver=driver)
+                # Small anti-bot jitter between requests on the same driver
+                time.sleep(random.uniform(0.2, 0.6))
+                return data
+            finally:
+                driver_pool.put(driver)
+
+        results = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for post_data in executor.map(scrape_one, post_urls):
+                results.append(post_data)
+                if on_result is not None:
+                    on_result(post_data)
+        return results
+
     def scrape_keyword(
         self, keyword: str, output_file: str = None, max_posts: int = 20
     ) -> List[Dict[str, Any]]:
@@ -662,17 +1246,18 @@ class XiaohongshuScraper:
 
         Args:
             keyword: Chinese keyword to search
-            output_file: Optional JSON file to save results
+            output_file: Optional NDJSON file to append results to, one
+                post per line as soon as it is scraped
             max_posts: Maximum number of posts to scrape
 
         Returns:
             List of post dictionaries
         """
-        logger.info(f"Starting scrape for keyword: {keyword}")
+        logger.info("Starting scrape for keyword: %s", keyword)
 
         # Search for posts
         post_urls = self.search_posts(keyword, min_likes=100, max_posts=max_posts)
-        logger.info(f"Found {len(post_urls)} posts meeting criteria")
+        logger.info("Found %s posts meeting criteria", len(post_urls))
 
         # If no posts found in normal mode but debug is on, try to get any posts
         if not post_urls and self.debug:
@@ -681,30 +1266,108 @@ class XiaohongshuScraper:
             )
             post_urls = self.search_posts(keyword, min_likes=0, max_posts=max_posts)
 
-        # Scrape each post
-        results = []
-        for i, url in enumerate(post_urls, 1):
-            logger.info(f"Scraping post {i}/{len(post_urls)}: {url}")
-            post_data = self.scrape_post_details(url)
-            results.append(post_data)
+        # Stream each post to disk as NDJSON the moment it is scraped, so a
+        # crash mid-crawl loses nothing and memory stays flat
+        out = None
+        if output_file:
+            out = open(output_file, "a", encoding="utf-8", buffering=1 << 20)
 
-            # Random delay between requests
-            time.sleep(random.uniform(3, 6))
+        def persist(post_data: Dict[str, Any]):
+            if out is not None:
+                out.write(
+                    json.dumps(
+                        post_data, ensure_ascii=False, separators=(",", ":")
+                    )
+                )
+                out.write("\n")
+                # Flush per post so a crash mid-crawl really does keep
+                # everything scraped so far
+                out.flush()
 
-        # Save to file if specified
-        if output_file:
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
-            logger.info(f"Results saved to {output_file}")
+        try:
+            # Scrape posts concurrently across a bounded pool of drivers
+            results = self._scrape_posts_concurrently(post_urls, on_result=persist)
+        finally:
+            if out is not None:
+                out.close()
+                logger.info("Results streamed to %s", output_file)
 
         return results
 
     def close(self):
-        """Close the browser driver"""
+        """Close the browser driver and any warm pool drivers"""
+        self._snapshot_pool.shutdown(wait=True)
+        for driver in self._extra_drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+        self._extra_drivers = []
         if hasattr(self, "driver"):
             self.driver.quit()
 
 
+def scrape_keywords(
+    keywords: List[str],
+    output_file: str = None,
+    max_posts: int = 20,
+    keyword_concurrency: int = 3,
+    headless: bool = False,
+    debug: bool = True,
+    max_concurrency: int = 4,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Crawl several keywords concurrently with independent scraper instances
+
+    Keywords are embarrassingly parallel — different URL spaces, different
+    cookies — so each worker owns its own scraper (and browser pool). When
+    output_file is given, each keyword's posts are appended to the shared
+    NDJSON file (tagged with their keyword) as soon as that crawl finishes.
+
+    Returns a mapping of keyword -> scraped posts.
+    """
+    if not keywords:
+        return {}
+
+    out = None
+    out_lock = threading.Lock()
+    if output_file:
+        out = open(output_file, "a", encoding="utf-8", buffering=1 << 20)
+
+    def crawl(keyword: str):
+        scraper = XiaohongshuScraper(
+            headless=headless, debug=debug, max_concurrency=max_concurrency
+        )
+        try:
+            posts = scraper.scrape_keyword(keyword, max_posts=max_posts)
+        finally:
+            scraper.close()
+        if out is not None:
+            with out_lock:
+                for post in posts:
+                    out.write(
+                        json.dumps(
+                            {"keyword": keyword, **post},
+                            ensure_ascii=False,
+                            separators=(",", ":"),
+                        )
+                    )
+                    out.write("\n")
+                out.flush()
+        return keyword, posts
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    try:
+        workers = min(keyword_concurrency, len(keywords))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for keyword, posts in executor.map(crawl, keywords):
+                results[keyword] = posts
+    finally:
+        if out is not None:
+            out.close()
+    return results
+
+
 def main():
     """Main function to run the scraper with enhanced debugging"""
     print("=" * 60)
@@ -753,7 +1416,7 @@ def main():
         print(f"Starting search for keyword: '{keyword}'...")
         results = scraper.scrape_keyword(
             keyword=keyword,
-            output_file=f"xiaohongshu_{keyword}_results.json",
+            output_file=f"xiaohongshu_{keyword}_results.ndjson",
             max_posts=max_posts,
         )
 
@@ -785,8 +1448,6 @@ def main():
 
     except Exception as e:
         print(f"\n❌ Error occurred: {e}")
-        import traceback
-
         print("\nFull traceback:")
         print(traceback.format_exc())
     finally: